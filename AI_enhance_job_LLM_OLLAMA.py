@@ -1,14 +1,13 @@
 # parameters of the agents
-import requests
-import time
-import os
+import asyncio
+import importlib.util
+import httpx
 import json
-try:
-    from dotenv import load_dotenv
-    has_dotenv = True
-except ImportError:
-    has_dotenv = False
-    print("Note: python-dotenv not installed. Using default configuration.")
+
+from config import get_settings
+from fused import FUSED_PROMPT, parse_fused_response
+from llm_cache import (cache_enabled, cache_key, get_cached, get_semantic_cache, json_dumps, json_loads,
+                       set_cached, singleflight)
 
 try:
     import fix_busted_json
@@ -16,115 +15,217 @@ try:
 except ImportError:
     has_fix_json = False
 
-# Load configuration from .env file
-if has_dotenv:
-    load_dotenv()
+# Reuse pooled keep-alive connections to Ollama across agent calls. HTTP/2 needs the
+# h2 package and only applies when Ollama sits behind a TLS gateway.
+client = httpx.AsyncClient(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+    timeout=httpx.Timeout(120.0, connect=5.0)
+)
 
-# Ollama local API setup
-OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
-MODEL = os.getenv("OLLAMA_MODEL", "llama3")
-TEMPERATURE = float(os.getenv("TEMPERATURE", "0.7"))
+def request_key(prompt, json_mode=False):
+    settings = get_settings()
+    return cache_key(model=settings.ollama_model, temperature=settings.temperature, prompt=prompt, json_mode=json_mode)
 
-# Output configuration
-SAVE_RESULTS = os.getenv("SAVE_RESULTS", "false").lower() == "true"
-OUTPUT_DIR = os.getenv("OUTPUT_DIR", "job_results")
+def parse_chunk(line):
+    """
+    Decodes one line of Ollama's streamed response
+    """
+    try:
+        return json_loads(line)
+    except json.JSONDecodeError:
+        if not has_fix_json:
+            raise
+        return json_loads(fix_busted_json.fix_busted_json(line))
+
+@singleflight(key_fn=lambda prompt, max_retries=3, json_mode=False, on_token=None: request_key(prompt, json_mode))
+async def ollama(prompt, max_retries=3, json_mode=False, on_token=None):
+    """
+    Streams a completion from Ollama. If given, on_token is called with each piece of text as it arrives.
+    """
+    settings = get_settings()
+    key = request_key(prompt, json_mode)
+    use_cache = cache_enabled(settings.temperature)
+    if use_cache and (cached := get_cached(key)) is not None:
+        if on_token:
+            on_token(cached)
+        return cached
 
-def ollama(prompt, max_retries=3):
     data = {
-        "model": MODEL,
+        "model": settings.ollama_model,
         "prompt": prompt,
-        "stream": False,
-        "options": {"temperature": TEMPERATURE}
+        "stream": True,
+        "options": {"temperature": settings.temperature}
     }
+    if json_mode:
+        # Constrains the model to emit valid JSON
+        data["format"] = "json"
+    payload = json_dumps(data)
 
     for attempt in range(max_retries):
         try:
-            response = requests.post(OLLAMA_URL, json=data)
-            response.raise_for_status()
-            return response.json()["response"]
-        except requests.exceptions.ConnectionError:
+            chunks = []
+            # Ollama streams one JSON object per line
+            async with client.stream("POST", settings.ollama_url, content=payload,
+                                     headers={"Content-Type": "application/json"}) as response:
+                if response.is_error:
+                    # Read the body so the error message from Ollama can be reported
+                    await response.aread()
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = parse_chunk(line)
+                    if "error" in chunk:
+                        # Ollama reports failures during generation in the stream itself;
+                        # not one of the retried exception types, so it surfaces immediately
+                        raise Exception(f"Ollama error: {chunk['error']}")
+                    text = chunk["response"]
+                    chunks.append(text)
+                    if on_token:
+                        on_token(text)
+            result = "".join(chunks)
+            if use_cache:
+                set_cached(key, result)
+            return result
+        except httpx.ConnectError as e:
             if attempt == max_retries - 1:
-                raise Exception("Failed to connect to Ollama server")
-            time.sleep(2 ** attempt)
-        except requests.exceptions.RequestException as e:
+                raise Exception("Failed to connect to Ollama server") from e
+            await asyncio.sleep(2 ** attempt)
+        except httpx.HTTPStatusError as e:
+            # Client errors such as an unknown model won't succeed on retry, so fail fast
+            if e.response.status_code < 500 or attempt == max_retries - 1:
+                raise Exception(f"Ollama returned HTTP {e.response.status_code}: {e.response.text}") from e
+            await asyncio.sleep(2 ** attempt)
+        except httpx.HTTPError as e:
             if attempt == max_retries - 1:
-                raise Exception(f"Failed after {max_retries} retries: {str(e)}")
-            time.sleep(2 ** attempt)
+                raise Exception(f"Failed after {max_retries} retries: {str(e)}") from e
+            if on_token and chunks:
+                # The retry streams the response again from its first token
+                print("\n[Response interrupted, retrying...]")
+            await asyncio.sleep(2 ** attempt)
         except (KeyError, json.JSONDecodeError) as e:
-            if has_fix_json:
-                try:
-                    fixed_json = fix_busted_json.fix_busted_json(response.text)
-                    return json.loads(fixed_json)["response"]
-                except:
-                    if attempt == max_retries - 1:
-                        raise Exception(f"Failed to parse response: {str(e)}")
-                    time.sleep(2 ** attempt)
-            else:
-                if attempt == max_retries - 1:
-                    raise Exception(f"Failed to parse response: {str(e)}")
-                time.sleep(2 ** attempt)
+            if attempt == max_retries - 1:
+                raise Exception(f"Failed to parse response: {str(e)}") from e
+            if on_token and chunks:
+                print("\n[Response interrupted, retrying...]")
+            await asyncio.sleep(2 ** attempt)
+
+# --- Prompt templates ---
+JOB_DESCRIPTION_PROMPT = """
+Generate a concise job description for a {job_title}.
+Include key responsibilities, required skills, and typical industries.
+Format the output clearly with bullet points.
+Keep your response under 200 words and focus on the most essential information.
+Use short, clear sentences and avoid unnecessary jargon.
+"""
+
+MISSIONS_TASKS_PROMPT = """
+Using ONLY the job description provided below, extract:
+- 3 key missions (numbered) - one sentence each
+- 5 main deliverables (bullet points) - one sentence each
+- 7 critical daily tasks (bullet points) - keep to 5-7 words each
+
+Do not add any information that is not directly derived from the job description.
+Keep your entire response under 250 words.
+Use clear, direct language and avoid unnecessary elaboration.
+
+Job Description: {job_description}
+"""
+
+AI_ENHANCEMENTS_PROMPT = """
+Concisely explain how AI can augment and improve this job role.
+Provide in bullet point format:
+1) Specific AI tools that could be used (3-4 tools, one sentence each)
+2) Automation opportunities (3-4 points, one sentence each)
+3) Efficiency gains (3-4 points, one sentence each)
+4) Risks to consider (3-4 points, one sentence each)
+
+Keep your entire response under 300 words.
+Use clear, direct language with no unnecessary elaboration.
+Focus on practical, actionable insights rather than theoretical possibilities.
+
+Job: {job_description}
+"""
+
+TECH_RECOMMENDATIONS_PROMPT = """
+Based on this job description, recommend 5 specific technologies and tools that would enhance this role.
+For each technology, provide a single concise paragraph (2-3 sentences) that includes:
+1) What it is and what it does
+2) How it specifically helps with this job role
+3) Approximate learning curve (easy/medium/difficult)
+4) Whether it's free/paid/open-source
+
+Format as a bulleted list with exactly 5 recommendations.
+Keep your entire response under 300 words.
+Focus on the most impactful technologies rather than covering everything possible.
+
+Job: {job_description}
+"""
+
+TRANSITION_PLAN_PROMPT = """
+You are a specialized AI transformation consultant with expertise in helping professionals transition to AI-augmented roles.
+Your task is to create a concise, practical, and actionable transition plan for a {job_title} to evolve into an AI-augmented professional.
+
+First, analyze this job description carefully: {job_description}
+{additional_context}
+
+Then, create a focused transition roadmap with the following sections, keeping the ENTIRE response under 600 words:
+
+1) SKILLS DEVELOPMENT PLAN (25% of your response):
+   - TECHNICAL SKILLS: List 3 specific technical skills most relevant for this role. For each, provide a one-sentence explanation of importance.
+   - SOFT SKILLS: List 3 critical soft skills needed when working with AI. One sentence each.
+   - LEARNING RESOURCES: For each skill, recommend ONE specific resource (course, book, or certification).
+
+2) AI TOOLS IMPLEMENTATION STRATEGY (25% of your response):
+   - IMMEDIATE ADOPTION (First 30 days): List 2 user-friendly AI tools with one-sentence descriptions.
+   - INTERMEDIATE ADOPTION (2-3 months): List 2 more advanced tools with one-sentence descriptions.
+   - ADVANCED ADOPTION (6-12 months): List 1 sophisticated AI solution with a one-sentence description.
+   - For each tool, only note whether it's free/paid/open-source.
+
+3) PSYCHOLOGICAL & ORGANIZATIONAL ADAPTATION (25% of your response):
+   - MINDSET EVOLUTION: 2-3 sentences on required mindset shifts.
+   - RESISTANCE MANAGEMENT: List 2 common resistance points with one-sentence strategies to overcome each.
+   - ETHICAL CONSIDERATIONS: List 1 key ethical consideration with a one-sentence recommendation.
+
+4) PHASED IMPLEMENTATION PLAN (25% of your response):
+   - FIRST 30 DAYS: 2-3 bullet points with specific goals.
+   - 2-3 MONTHS: 2-3 bullet points with specific goals.
+   - 6-12 MONTHS: 2-3 bullet points with specific goals.
+   - SUCCESS METRICS: List 3 specific metrics (one sentence each).
+
+Format your response with clear headings and bullet points. Use extremely concise language. Make all recommendations highly specific to the {job_title} role, not generic advice. Prioritize brevity and clarity over comprehensiveness.
+"""
 
 # --- Define Agents ---
-def Agent_get_job_description(job_title):
-    prompt = f"""
-    Generate a concise job description for a {job_title}.
-    Include key responsibilities, required skills, and typical industries.
-    Format the output clearly with bullet points.
-    Keep your response under 200 words and focus on the most essential information.
-    Use short, clear sentences and avoid unnecessary jargon.
-    """
-    return ollama(prompt)
-
-def Agent_get_missions_and_tasks(job_description):
-    prompt = f"""
-    Using ONLY the job description provided below, extract:
-    - 3 key missions (numbered) - one sentence each
-    - 5 main deliverables (bullet points) - one sentence each
-    - 7 critical daily tasks (bullet points) - keep to 5-7 words each
-
-    Do not add any information that is not directly derived from the job description.
-    Keep your entire response under 250 words.
-    Use clear, direct language and avoid unnecessary elaboration.
-
-    Job Description: {job_description}
-    """
-    return ollama(prompt)
-
-def Agent_get_ai_enhancements(job_description):
-    prompt = f"""
-    Concisely explain how AI can augment and improve this job role.
-    Provide in bullet point format:
-    1) Specific AI tools that could be used (3-4 tools, one sentence each)
-    2) Automation opportunities (3-4 points, one sentence each)
-    3) Efficiency gains (3-4 points, one sentence each)
-    4) Risks to consider (3-4 points, one sentence each)
-
-    Keep your entire response under 300 words.
-    Use clear, direct language with no unnecessary elaboration.
-    Focus on practical, actionable insights rather than theoretical possibilities.
-
-    Job: {job_description}
-    """
-    return ollama(prompt)
-
-def Agent_get_technology_recommendations(job_description):
-    prompt = f"""
-    Based on this job description, recommend 5 specific technologies and tools that would enhance this role.
-    For each technology, provide a single concise paragraph (2-3 sentences) that includes:
-    1) What it is and what it does
-    2) How it specifically helps with this job role
-    3) Approximate learning curve (easy/medium/difficult)
-    4) Whether it's free/paid/open-source
-
-    Format as a bulleted list with exactly 5 recommendations.
-    Keep your entire response under 300 words.
-    Focus on the most impactful technologies rather than covering everything possible.
-
-    Job: {job_description}
-    """
-    return ollama(prompt)
-
-def Agent_get_transition_recommendations(job_title, job_description, ai_enhancements=None, tech_recommendations=None):
+async def Agent_get_job_description(job_title, on_token=None):
+    # Near-duplicate titles share a description, and every later agent builds on it
+    semantic_cache = await get_semantic_cache()
+    namespace = f"job_desc:{get_settings().ollama_model}"
+    if semantic_cache and (cached := await semantic_cache.get(namespace, job_title)) is not None:
+        if on_token:
+            on_token(cached)
+        return cached
+
+    prompt = JOB_DESCRIPTION_PROMPT.format(job_title=job_title)
+    result = await ollama(prompt, on_token=on_token)
+    if semantic_cache:
+        await semantic_cache.add(namespace, job_title, result)
+    return result
+
+async def Agent_get_missions_and_tasks(job_description):
+    prompt = MISSIONS_TASKS_PROMPT.format(job_description=job_description)
+    return await ollama(prompt)
+
+async def Agent_get_ai_enhancements(job_description):
+    prompt = AI_ENHANCEMENTS_PROMPT.format(job_description=job_description)
+    return await ollama(prompt)
+
+async def Agent_get_technology_recommendations(job_description):
+    prompt = TECH_RECOMMENDATIONS_PROMPT.format(job_description=job_description)
+    return await ollama(prompt)
+
+async def Agent_get_transition_recommendations(job_title, job_description, ai_enhancements=None, tech_recommendations=None):
     # Prepare additional context if available
     additional_context = ""
     if ai_enhancements:
@@ -132,97 +233,112 @@ def Agent_get_transition_recommendations(job_title, job_description, ai_enhancem
     if tech_recommendations:
         additional_context += f"\n\nRECOMMENDED TECHNOLOGIES:\n{tech_recommendations}"
 
-    prompt = f"""
-    You are a specialized AI transformation consultant with expertise in helping professionals transition to AI-augmented roles.
-    Your task is to create a concise, practical, and actionable transition plan for a {job_title} to evolve into an AI-augmented professional.
-
-    First, analyze this job description carefully: {job_description}
-    {additional_context}
-
-    Then, create a focused transition roadmap with the following sections, keeping the ENTIRE response under 600 words:
-
-    1) SKILLS DEVELOPMENT PLAN (25% of your response):
-       - TECHNICAL SKILLS: List 3 specific technical skills most relevant for this role. For each, provide a one-sentence explanation of importance.
-       - SOFT SKILLS: List 3 critical soft skills needed when working with AI. One sentence each.
-       - LEARNING RESOURCES: For each skill, recommend ONE specific resource (course, book, or certification).
-
-    2) AI TOOLS IMPLEMENTATION STRATEGY (25% of your response):
-       - IMMEDIATE ADOPTION (First 30 days): List 2 user-friendly AI tools with one-sentence descriptions.
-       - INTERMEDIATE ADOPTION (2-3 months): List 2 more advanced tools with one-sentence descriptions.
-       - ADVANCED ADOPTION (6-12 months): List 1 sophisticated AI solution with a one-sentence description.
-       - For each tool, only note whether it's free/paid/open-source.
-
-    3) PSYCHOLOGICAL & ORGANIZATIONAL ADAPTATION (25% of your response):
-       - MINDSET EVOLUTION: 2-3 sentences on required mindset shifts.
-       - RESISTANCE MANAGEMENT: List 2 common resistance points with one-sentence strategies to overcome each.
-       - ETHICAL CONSIDERATIONS: List 1 key ethical consideration with a one-sentence recommendation.
-
-    4) PHASED IMPLEMENTATION PLAN (25% of your response):
-       - FIRST 30 DAYS: 2-3 bullet points with specific goals.
-       - 2-3 MONTHS: 2-3 bullet points with specific goals.
-       - 6-12 MONTHS: 2-3 bullet points with specific goals.
-       - SUCCESS METRICS: List 3 specific metrics (one sentence each).
-
-    Format your response with clear headings and bullet points. Use extremely concise language. Make all recommendations highly specific to the {job_title} role, not generic advice. Prioritize brevity and clarity over comprehensiveness.
-    """
-    return ollama(prompt)
+    prompt = TRANSITION_PLAN_PROMPT.format(
+        job_title=job_title,
+        job_description=job_description,
+        additional_context=additional_context
+    )
+    return await ollama(prompt)
 
-def Agent_enhance_job_with_ai(job_title):
+async def Agent_enhance_job_with_ai(job_title):
     print(f"\nAnalyzing: {job_title}\n")
     results = {}
 
     try:
         # Agent 1: Job Description
+        # Stream the description as it is generated, since every other agent waits on it
         print("Generating job description:")
-        results['job_desc'] = Agent_get_job_description(job_title)
+        results['job_desc'] = await Agent_get_job_description(job_title, on_token=print_token)
+        print()
 
-        # Agent 2: Missions & Tasks
+        # Agents 2-4 only depend on the job description, so run them concurrently.
+        # Unless HIGH_QUALITY is set, the transition plan is drafted alongside them from
+        # the job description alone, saving a round-trip.
+        high_quality = get_settings().high_quality
         print("Extracting missions and tasks:")
-        results['missions_tasks'] = Agent_get_missions_and_tasks(results['job_desc'])
-
-        # Agent 3: Technology Recommendations
         print("Recommending technologies:")
-        results['tech_recommendations'] = Agent_get_technology_recommendations(results['job_desc'])
-
-        # Agent 4: AI Enhancements
         print("Identifying AI enhancements:")
-        results['ai_enhancements'] = Agent_get_ai_enhancements(results['job_desc'])
-
-        # Agent 5: Transition recommendations
-        print("Creating transition plan:")
-        results['transition_plan'] = Agent_get_transition_recommendations(
-            job_title,
-            results['job_desc'],
-            ai_enhancements=results['ai_enhancements'],
-            tech_recommendations=results['tech_recommendations']
-        )
+        agents = [
+            Agent_get_missions_and_tasks(results['job_desc']),
+            Agent_get_technology_recommendations(results['job_desc']),
+            Agent_get_ai_enhancements(results['job_desc'])
+        ]
+        if not high_quality:
+            print("Creating transition plan:")
+            agents.append(Agent_get_transition_recommendations(job_title, results['job_desc']))
+        names = ('missions_tasks', 'tech_recommendations', 'ai_enhancements', 'transition_plan')
+        results.update(zip(names, await asyncio.gather(*agents)))
+
+        if high_quality:
+            # Agent 5: Transition recommendations, building on the AI enhancements and technologies
+            print("Creating transition plan:")
+            results['transition_plan'] = await Agent_get_transition_recommendations(
+                job_title,
+                results['job_desc'],
+                ai_enhancements=results['ai_enhancements'],
+                tech_recommendations=results['tech_recommendations']
+            )
 
         # Output
-        print("\n" + "*"*70)
-        print(f"**Job Description for {job_title}:**\n{results['job_desc']}\n")
-        print(f"**Missions, Deliverables & Tasks:**\n{results['missions_tasks']}\n")
-        print(f"**Technology Recommendations:**\n{results['tech_recommendations']}\n")
-        print(f"**AI Augmentation Opportunities:**\n{results['ai_enhancements']}\n")
-        print(f"**Transition to AI-Augmented Role:**\n{results['transition_plan']}\n")
-        print("*"*70)
+        display_results(job_title, results)
 
     except Exception as e:
         print(f"\nError: {str(e)}")
 
+async def Agent_enhance_job_with_ai_fused(job_title):
+    """
+    Runs the whole analysis as a single LLM call that answers every agent's task in one JSON object
+    """
+    # Ollama has no separate system prompt, so the persona leads the prompt
+    prompt = "\nYou are a specialized AI transformation consultant with expertise in helping professionals transition to AI-augmented roles." + FUSED_PROMPT.format(job_title=job_title)
+
+    print(f"\nAnalyzing: {job_title}\n")
+
+    try:
+        print("Running all agents in a single call:")
+        results = parse_fused_response(await ollama(prompt, json_mode=True))
+        display_results(job_title, results)
+
+    except Exception as e:
+        print(f"\nError: {str(e)}")
+
+def print_token(text):
+    print(text, end="", flush=True)
+
+def display_results(job_title, results):
+    print("\n" + "*"*70)
+    print(f"**Job Description for {job_title}:**\n{results['job_desc']}\n")
+    print(f"**Missions, Deliverables & Tasks:**\n{results['missions_tasks']}\n")
+    print(f"**Technology Recommendations:**\n{results['tech_recommendations']}\n")
+    print(f"**AI Augmentation Opportunities:**\n{results['ai_enhancements']}\n")
+    print(f"**Transition to AI-Augmented Role:**\n{results['transition_plan']}\n")
+    print("*"*70)
+
 def welcome():
+    settings = get_settings()
     print("\n" + "*"*70)
     print("AI JOB ENHANCEMENT TOOL")
     print("*"*70)
     print("Here, AI analyzes jobs and provides AI enhancement recommendations.")
-    print(f"Using model: {MODEL} | Temperature: {TEMPERATURE}")
+    print(f"Using model: {settings.ollama_model} | Temperature: {settings.temperature}")
 
-# main program
-if __name__ == "__main__":
+async def main():
     welcome()
 
-    while True:
-        user_job = input("\nEnter a job title (or 'quit' to exit): ").strip()
-        if user_job.lower() in ('quit', 'exit', 'end'):
-            print("\nThank you for using the AI Job Enhancement Tool!\n")
-            break
-        Agent_enhance_job_with_ai(user_job)
+    try:
+        while True:
+            user_job = input("\nEnter a job title (or 'quit' to exit): ").strip()
+            if user_job.lower() in ('quit', 'exit', 'end'):
+                print("\nThank you for using the AI Job Enhancement Tool!\n")
+                break
+            if get_settings().fused_pipeline:
+                await Agent_enhance_job_with_ai_fused(user_job)
+            else:
+                await Agent_enhance_job_with_ai(user_job)
+    finally:
+        # The pooled connections belong to this event loop, so close them before it ends
+        await client.aclose()
+
+# main program
+if __name__ == "__main__":
+    asyncio.run(main())
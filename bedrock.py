@@ -0,0 +1,214 @@
+# AWS Bedrock access shared by the Claude agents
+import asyncio
+import functools
+import threading
+import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+
+from config import Settings, get_settings
+from llm_cache import cache_enabled, cache_key, get_cached, json_dumps, json_loads, set_cached, singleflight
+
+try:
+    import aioboto3
+    has_aioboto3 = True
+except ImportError:
+    has_aioboto3 = False
+
+SYSTEM_PROMPT = "You are a specialized AI transformation consultant with expertise in helping professionals transition to AI-augmented roles."
+
+_thread_local = threading.local()
+
+def bedrock_config(settings: Settings) -> Config:
+    return Config(
+        region_name=settings.aws_region,
+        retries={
+            'max_attempts': 5,
+            'mode': 'standard'
+        }
+    )
+
+# Settings is frozen and hashable, so these are rebuilt only when get_settings() is reloaded
+@functools.lru_cache(maxsize=1)
+def get_session(settings: Settings) -> Any:
+    return aioboto3.Session(
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region
+    )
+
+@functools.lru_cache(maxsize=1)
+def get_executor(max_workers: int) -> ThreadPoolExecutor:
+    # Each streamed boto3 call holds a worker thread until it finishes, and the
+    # default executor (cpu_count + 4 threads) would queue parallel requests
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bedrock")
+
+def client_factory() -> Any:
+    """
+    Returns an async context manager yielding a Bedrock runtime client
+    """
+    settings = get_settings()
+    return get_session(settings).client(service_name='bedrock-runtime', config=bedrock_config(settings))
+
+def get_client() -> Any:
+    """
+    Returns the synchronous Bedrock client for the calling thread, creating it on first use
+    """
+    # Created lazily so importing the module doesn't require AWS configuration, and per
+    # thread because boto3 sessions must not be shared between threads
+    settings = get_settings()
+    if getattr(_thread_local, "settings", None) is not settings:
+        _thread_local.client = boto3.session.Session().client(
+            service_name='bedrock-runtime',
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            config=bedrock_config(settings)
+        )
+        _thread_local.settings = settings
+    return _thread_local.client
+
+def delta_text(event: Dict) -> Optional[str]:
+    """
+    Returns the generated text carried by a response stream event, if any
+    """
+    chunk = json_loads(event['chunk']['bytes'])
+    if chunk['type'] == 'content_block_delta':
+        return chunk['delta']['text']
+    return None
+
+async def stream_bedrock(body: Union[str, bytes], model_id: str) -> AsyncIterator[str]:
+    """
+    Sends a request to Bedrock and yields the response text as it is generated
+    """
+    if has_aioboto3:
+        async with client_factory() as client:
+            response = await client.invoke_model_with_response_stream(body=body, modelId=model_id)
+            async for event in response['body']:
+                if (text := delta_text(event)) is not None:
+                    yield text
+        return
+
+    # boto3 is synchronous, so read the stream in a worker thread and hand events over through a queue
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    stop = threading.Event()
+
+    def read_stream():
+        try:
+            response = get_client().invoke_model_with_response_stream(body=body, modelId=model_id)
+            stream = response['body']
+            try:
+                for event in stream:
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            finally:
+                stream.close()
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    reader = loop.run_in_executor(get_executor(get_settings().max_parallel_requests), read_stream)
+    try:
+        while (event := await events.get()) is not None:
+            if (text := delta_text(event)) is not None:
+                yield text
+        # Re-raises any error from the worker thread
+        await reader
+    finally:
+        # If the consumer stopped early (bad event, cancellation), make the worker close the
+        # stream at its next event instead of draining the whole response into the queue
+        stop.set()
+        reader.cancel()
+
+def text_block(text: str) -> Dict:
+    block = {"type": "text", "text": text}
+    if get_settings().prompt_caching:
+        # Everything up to and including this block is cached by Bedrock
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+def job_context(job_description: str) -> str:
+    # Must be byte-identical across agents for the prompt cache to hit
+    return f"Job Description: {job_description}"
+
+def request_key(prompt: str, context: Optional[str] = None, model_id: Optional[str] = None,
+                temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+    settings = get_settings()
+    # The formulaic agents run on a faster, cheaper model unless told otherwise
+    model_id = model_id or settings.claude_model_light
+    temperature = settings.temperature if temperature is None else temperature
+    max_tokens = max_tokens or settings.max_tokens
+    return cache_key(model=model_id, temperature=temperature, max_tokens=max_tokens, system=SYSTEM_PROMPT,
+                     context=context, prompt=prompt)
+
+async def claude_stream(prompt: str, context: Optional[str] = None, model_id: Optional[str] = None,
+                        temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Streams a Claude response through AWS Bedrock, yielding text as it is generated.
+    The optional context is sent before the prompt as a separate, cacheable block.
+    Unset model_id, temperature and max_tokens come from the settings.
+    """
+    settings = get_settings()
+    content = []
+    if context:
+        content.append(text_block(context))
+    content.append({"type": "text", "text": prompt})
+
+    body = json_dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens or settings.max_tokens,
+        "temperature": settings.temperature if temperature is None else temperature,
+        "system": [text_block(SYSTEM_PROMPT)],
+        "messages": [
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
+    })
+
+    async for text in stream_bedrock(body, model_id or settings.claude_model_light):
+        yield text
+
+@singleflight(key_fn=lambda prompt, context=None, model_id=None, *args, temperature=None, max_tokens=None, **kwargs:
+              request_key(prompt, context, model_id, temperature, max_tokens))
+async def claude(prompt: str, context: Optional[str] = None, model_id: Optional[str] = None, max_retries: int = 3,
+                 on_token: Optional[Callable[[str], None]] = None, *,
+                 temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+    """
+    Invokes Claude model through AWS Bedrock without blocking the event loop.
+    If given, on_token is called with each piece of text as it arrives.
+    """
+    settings = get_settings()
+    key = request_key(prompt, context, model_id, temperature, max_tokens)
+    use_cache = cache_enabled(settings.temperature if temperature is None else temperature)
+    if use_cache and (cached := get_cached(key)) is not None:
+        if on_token:
+            on_token(cached)
+        return cached
+
+    if not settings.aws_access_key_id or not settings.aws_secret_access_key:
+        raise Exception("AWS credentials not found. Please add your AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY to the .env file.")
+
+    for attempt in range(max_retries):
+        try:
+            chunks = []
+            async for text in claude_stream(prompt, context, model_id, temperature, max_tokens):
+                chunks.append(text)
+                if on_token:
+                    on_token(text)
+            result = "".join(chunks)
+            if use_cache:
+                set_cached(key, result)
+            return result
+        except Exception as e:
+            if attempt == max_retries - 1:
+                if isinstance(e, ClientError):
+                    raise Exception(f"Failed after {max_retries} retries: {str(e)}")
+                raise Exception(f"Failed to parse response: {str(e)}")
+            if on_token and chunks:
+                # The retry streams the response again from its first token
+                print("\n[Response interrupted, retrying...]")
+            await asyncio.sleep(2 ** attempt)
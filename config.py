@@ -0,0 +1,79 @@
+# settings shared by the agents
+import functools
+import os
+from dataclasses import dataclass, fields
+
+try:
+    from dotenv import dotenv_values
+    has_dotenv = True
+except ImportError:
+    has_dotenv = False
+    print("Note: python-dotenv not installed. Using default configuration.")
+
+@dataclass(frozen=True)
+class Settings:
+    # AWS Bedrock
+    aws_region: str = "us-east-1"
+    aws_access_key_id: str = ""
+    aws_secret_access_key: str = ""
+    claude_model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"
+    claude_model_light: str = "anthropic.claude-3-haiku-20240307-v1:0"
+    claude_model_heavy: str = ""
+    max_tokens: int = 4000
+    prompt_caching: bool = False
+    max_parallel_requests: int = (os.cpu_count() or 1) * 5
+    max_parallel_jobs: int = 4
+
+    # Ollama
+    ollama_url: str = "http://localhost:11434/api/generate"
+    ollama_model: str = "llama3"
+
+    # Generation
+    temperature: float = 0.7
+    fused_pipeline: bool = False
+    high_quality: bool = False
+
+    # Agent memory
+    agent_memory_max: int = 100
+    agent_memory_light: bool = False
+
+    # Response caches
+    cache_enabled: bool = False
+    cache_dir: str = "./.llm_cache"
+    cache_ttl: int = 86400
+    cache_max_entries: int = 1000
+    semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_entries: int = 1000
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Output
+    save_results: bool = False
+    output_dir: str = "job_results"
+
+    @property
+    def model_heavy(self):
+        # The transition plan falls back to the main model when no heavy model is set
+        return self.claude_model_heavy or self.claude_model_id
+
+def _from_env(field, env):
+    # Each setting is read from the upper-cased field name, e.g. aws_region from AWS_REGION
+    value = env.get(field.name.upper())
+    if value is None:
+        return field.default
+    if field.type is bool:
+        return value.lower() in ("1", "true")
+    return field.type(value)
+
+@functools.cache
+def get_settings():
+    """
+    Reads the configuration from the environment and .env once; environment
+    variables take precedence over .env. Call get_settings.cache_clear() to
+    pick up changes to either.
+    """
+    # .env is merged here rather than loaded into os.environ, so a reload re-reads the file
+    env = {key: value for key, value in dotenv_values().items() if value is not None} if has_dotenv else {}
+    env.update(os.environ)
+
+    return Settings(**{field.name: _from_env(field, env) for field in fields(Settings)})
@@ -0,0 +1,79 @@
+# single-call pipeline shared by the Claude and Ollama versions
+import json
+
+from llm_cache import json_loads
+
+try:
+    import fix_busted_json
+    has_fix_json = True
+except ImportError:
+    has_fix_json = False
+
+FUSED_PROMPT = """
+Complete the five tasks below for a {job_title}, in order. Later tasks must build on your answers to the earlier ones.
+
+TASK "job_desc":
+Generate a concise job description for a {job_title}.
+Include key responsibilities, required skills, and typical industries.
+Format the output clearly with bullet points.
+Keep it under 200 words and focus on the most essential information.
+
+TASK "missions_tasks":
+Using ONLY your job description, extract:
+- 3 key missions (numbered) - one sentence each
+- 5 main deliverables (bullet points) - one sentence each
+- 7 critical daily tasks (bullet points) - keep to 5-7 words each
+Keep it under 250 words.
+
+TASK "tech_recommendations":
+Recommend 5 specific technologies and tools that would enhance this role, as a bulleted list.
+For each, give a single concise paragraph (2-3 sentences) covering what it does, how it helps with this role,
+the approximate learning curve (easy/medium/difficult) and whether it's free/paid/open-source.
+Keep it under 300 words.
+
+TASK "ai_enhancements":
+Concisely explain how AI can augment and improve this job role, in bullet point format:
+1) Specific AI tools that could be used (3-4 tools, one sentence each)
+2) Automation opportunities (3-4 points, one sentence each)
+3) Efficiency gains (3-4 points, one sentence each)
+4) Risks to consider (3-4 points, one sentence each)
+Keep it under 300 words.
+
+TASK "transition_plan":
+Create a focused transition roadmap for a {job_title} to evolve into an AI-augmented professional, using your
+technology recommendations and AI enhancements, with these sections and under 600 words in total:
+1) SKILLS DEVELOPMENT PLAN: 3 technical skills, 3 soft skills, and ONE learning resource per skill.
+2) AI TOOLS IMPLEMENTATION STRATEGY: 2 tools for the first 30 days, 2 for 2-3 months, 1 for 6-12 months,
+   each with a one-sentence description and whether it's free/paid/open-source.
+3) PSYCHOLOGICAL & ORGANIZATIONAL ADAPTATION: mindset evolution (2-3 sentences), 2 resistance points with
+   one-sentence strategies, and 1 ethical consideration with a one-sentence recommendation.
+4) PHASED IMPLEMENTATION PLAN: 2-3 goals each for the first 30 days, 2-3 months and 6-12 months, plus 3 success metrics.
+
+Use clear, direct language with no unnecessary elaboration, and make every answer specific to the {job_title} role.
+
+Respond with only a JSON object conforming to this schema, with no text before or after it:
+{{"job_desc": string, "missions_tasks": string, "tech_recommendations": string, "ai_enhancements": string, "transition_plan": string}}
+Each value is the complete answer to that task as one string, keeping its headings and bullet points.
+"""
+
+FUSED_RESULT_KEYS = ('job_desc', 'missions_tasks', 'tech_recommendations', 'ai_enhancements', 'transition_plan')
+
+def parse_fused_response(text):
+    """
+    Extracts the JSON object from a fused response and checks every section is present
+    """
+    # Models sometimes wrap the object in a code fence or a sentence
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end != -1:
+        text = text[start:end + 1]
+    try:
+        results = json_loads(text)
+    except json.JSONDecodeError:
+        if not has_fix_json:
+            raise
+        results = json_loads(fix_busted_json.fix_busted_json(text))
+
+    missing = [key for key in FUSED_RESULT_KEYS if not results.get(key)]
+    if missing:
+        raise Exception(f"Fused response is missing sections: {', '.join(missing)}")
+    return {key: results[key] for key in FUSED_RESULT_KEYS}
@@ -0,0 +1,184 @@
+# response caching and JSON helpers shared by the agents
+import asyncio
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from config import get_settings
+
+try:
+    import diskcache
+    has_diskcache = True
+except ImportError:
+    has_diskcache = False
+
+# orjson is several times faster than the json module. Its dumps() returns bytes,
+# which are accepted as a request body, and its decode errors subclass json.JSONDecodeError.
+try:
+    import orjson
+    json_dumps, json_loads = orjson.dumps, orjson.loads
+except ImportError:
+    json_dumps, json_loads = json.dumps, json.loads
+
+class MemoryCache:
+    """
+    In-process fallback used when diskcache is not installed, evicting the
+    least recently used entry beyond max_entries
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, expire=None):
+        expires_at = time.monotonic() + expire if expire is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+@functools.lru_cache(maxsize=1)
+def _open_cache(cache_dir, max_entries):
+    # diskcache bounds itself by size on disk (1 GB by default)
+    return diskcache.Cache(cache_dir) if has_diskcache else MemoryCache(max_entries)
+
+def _get_cache():
+    settings = get_settings()
+    return _open_cache(settings.cache_dir, settings.cache_max_entries)
+
+def cache_key(**params):
+    """
+    Hashes the request parameters that determine an LLM response
+    """
+    payload = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def cache_enabled(temperature):
+    """
+    Responses are only reused for deterministic calls, unless CACHE_ENABLED is set
+    """
+    return get_settings().cache_enabled or temperature == 0
+
+def get_cached(key):
+    return _get_cache().get(key)
+
+def set_cached(key, value):
+    _get_cache().set(key, value, expire=get_settings().cache_ttl)
+
+_inflight = {}
+
+def singleflight(key_fn):
+    """
+    Coalesces concurrent calls that share a key into one in-flight call,
+    so a burst of identical prompts on a cold cache reaches the LLM once.
+    The key should leave out on_token, which is passed as a keyword argument.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = key_fn(*args, **kwargs)
+            task = _inflight.get(key)
+            joined = task is not None
+            if not joined:
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                _inflight[key] = task
+                task.add_done_callback(lambda _: _inflight.pop(key, None))
+            # Shield so one cancelled caller does not cancel the call for the others
+            result = await asyncio.shield(task)
+            # Only the caller that started the call streams its tokens; a caller that
+            # joined it gets the whole response through its own on_token at the end
+            on_token = kwargs.get("on_token")
+            if joined and on_token:
+                on_token(result)
+            return result
+        return wrapper
+    return decorator
+
+class SemanticCache:
+    """
+    Reuses responses for inputs whose embeddings are nearly identical,
+    e.g. "Data Scientist" and "data scientist". Each namespace keeps at most
+    max_entries responses, dropping the oldest first.
+    """
+    def __init__(self, model_name, threshold, max_entries):
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self._faiss = faiss
+        self._model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._indexes = {}
+        self._responses = {}
+
+    async def _embed(self, text):
+        # Encoding is CPU-bound, so keep it off the event loop; the index itself is only
+        # touched from the loop, since FAISS does not allow adds concurrent with searches
+        embedding = await asyncio.to_thread(self._model.encode, [text], normalize_embeddings=True)
+        # Normalized vectors make inner product equal to cosine similarity
+        return embedding.astype("float32")
+
+    async def get(self, namespace, text):
+        index = self._indexes.get(namespace)
+        if index is None or index.ntotal == 0:
+            return None
+        scores, ids = index.search(await self._embed(text), 1)
+        if scores[0][0] > self.threshold:
+            return self._responses[namespace][ids[0][0]]
+        return None
+
+    async def add(self, namespace, text, response):
+        embedding = await self._embed(text)
+        if namespace not in self._indexes:
+            self._indexes[namespace] = self._faiss.IndexFlatIP(embedding.shape[1])
+            self._responses[namespace] = []
+        index, responses = self._indexes[namespace], self._responses[namespace]
+        index.add(embedding)
+        responses.append(response)
+        if index.ntotal > self.max_entries:
+            # Removing from a flat index renumbers the remaining vectors, keeping them aligned with responses
+            index.remove_ids(self._faiss.IDSelectorRange(0, 1))
+            del responses[0]
+
+_semantic_cache = None
+_semantic_unavailable = False
+
+@singleflight(key_fn=lambda settings: ("semantic_cache", settings.embedding_model))
+async def _load_semantic_cache(settings):
+    global _semantic_cache, _semantic_unavailable
+    try:
+        # Loading the embedding model takes seconds, so do it off the event loop
+        _semantic_cache = await asyncio.to_thread(
+            SemanticCache, settings.embedding_model, settings.semantic_cache_threshold,
+            settings.semantic_cache_max_entries)
+    except ImportError:
+        _semantic_unavailable = True
+        print("Note: faiss or sentence-transformers not installed. Semantic cache disabled.")
+    except Exception as e:
+        # e.g. offline, or EMBEDDING_MODEL does not exist; don't retry the load on every call
+        _semantic_unavailable = True
+        print(f"Note: could not load embedding model {settings.embedding_model}: {e}. Semantic cache disabled.")
+
+async def get_semantic_cache():
+    """
+    Returns the shared SemanticCache, or None when SEMANTIC_CACHE is off
+    or its dependencies are not installed
+    """
+    settings = get_settings()
+    if not settings.semantic_cache or _semantic_unavailable:
+        return None
+    if _semantic_cache is None:
+        await _load_semantic_cache(settings)
+    return _semantic_cache